@@ -361,50 +361,61 @@ async def register_inference_result(
     Returns:
     - The inference_dict with the inference_id, box_id and top_id added.
     """
+    if not validator.is_valid_uuid(user_id):
+        raise user.UserNotFoundError(f"User not found based on the given id: {user_id}")
+    if not validator.is_valid_uuid(picture_id):
+        raise picture.PictureNotFoundError(f"Picture not found based on the given id: {picture_id}")
+    user_id = uuid.UUID(str(user_id))
+    picture_id = uuid.UUID(str(picture_id))
     try:
         trimmed_inference = inference_metadata.build_inference_import(inference_dict)
-        inference_id = inference.new_inference(
-            cursor, trimmed_inference, user_id, picture_id, type
-        )
         nb_object = int(inference_dict["totalBoxes"])
-        inference_dict["inference_id"] = str(inference_id)
-        # loop through the boxes
-        for box_index in range(nb_object):
+        if nb_object > len(inference_dict["boxes"]):
+            raise inference.InferenceCreationError(
+                "Error: totalBoxes is greater than the number of boxes"
+            )
+        boxes = inference_dict["boxes"][:nb_object]
+        predictions_by_box = [
+            box["topN"] if "topN" in box else [box] for box in boxes
+        ]
+        # Retrieve the seed_id of every label at once
+        seed_ids = seed.get_seed_ids(
+            cursor,
+            [
+                prediction["label"]
+                for predictions in predictions_by_box
+                for prediction in predictions
+            ],
+        )
+        # build the whole inference tree to upload it in a single query
+        objects = []
+        for box, predictions in zip(boxes, predictions_by_box):
             # TODO: adapt for multiple types of objects
             if type == 1:
-                # TODO : adapt for the seed_id in the inference_dict
-                top_id = seed.get_seed_id(
-                    cursor, inference_dict["boxes"][box_index]["label"]
-                )
-                inference_dict["boxes"][box_index]["object_type_id"] = 1
+                box["object_type_id"] = 1
             else:
                 raise inference.InferenceCreationError("Error: type not recognized")
-            box = inference_metadata.build_object_import(
-                inference_dict["boxes"][box_index]
-            )
-            object_inference_id = inference.new_inference_object(
-                cursor, inference_id, box, type, False
+            seeds = [
+                {"seed_id": seed_ids[prediction["label"]], "score": prediction["score"]}
+                for prediction in predictions
+            ]
+            objects.append(
+                {
+                    "box_metadata": inference_metadata.build_object_import(box),
+                    "type_id": type,
+                    "seeds": seeds,
+                }
             )
-            inference_dict["boxes"][box_index]["box_id"] = str(object_inference_id)
-            # loop through the topN Prediction
-            top_score = -1
-            if "topN" in inference_dict["boxes"][box_index]:
-                for topN in inference_dict["boxes"][box_index]["topN"]:
-
-                    # Retrieve the right seed_id
-                    seed_id = seed.get_seed_id(cursor, topN["label"])
-                    id = inference.new_seed_object(
-                        cursor, seed_id, object_inference_id, topN["score"]
-                    )
-                    topN["object_id"] = str(id)
-                    if topN["score"] > top_score:
-                        top_score = topN["score"]
-                        top_id = id
-            else:
-                seed_id = seed.get_seed_id(cursor, inference_dict["boxes"][box_index]["label"])
-                top_id = inference.new_seed_object(cursor, seed_id, object_inference_id, inference_dict["boxes"][box_index]["score"])
-            inference.set_inference_object_top_id(cursor, object_inference_id, top_id)
-            inference_dict["boxes"][box_index]["top_id"] = str(top_id)
+        inference_id = inference.create_inference_tree(
+            cursor, trimmed_inference, user_id, picture_id, objects
+        )
+        inference_dict["inference_id"] = str(inference_id)
+        for box, obj in zip(boxes, objects):
+            box["box_id"] = obj["id"]
+            box["top_id"] = obj["top_id"]
+            if "topN" in box:
+                for topN, seed_obj in zip(box["topN"], obj["seeds"]):
+                    topN["object_id"] = seed_obj["id"]
 
         return inference_dict
     except ValueError:
@@ -420,12 +431,16 @@ async def new_correction_inference_feedback(cursor,inference_dict, type: int = 1
     try:
         if "inferenceId" in inference_dict.keys():
             inference_id = inference_dict["inferenceId"]
+            if not validator.is_valid_uuid(inference_id):
+                raise InferenceFeedbackError(f"Error: inference_id {inference_id} is not a valid UUID")
+            inference_id = uuid.UUID(str(inference_id))
         else:
             raise InferenceFeedbackError("Error: inference_id not found in the given infence_dict")
         if "userId" in inference_dict.keys():
             user_id = inference_dict["userId"]
-            if not (user.is_a_user_id(cursor, user_id)):
+            if not validator.is_valid_uuid(user_id) or not (user.is_a_user_id(cursor, user_id)):
                 raise InferenceFeedbackError(f"Error: user_id {user_id} not found in the database")
+            user_id = uuid.UUID(str(user_id))
         else:
             raise InferenceFeedbackError("Error: user_id not found in the given infence_dict")
         # if infence_dict["totalBoxes"] != len(inference_dict["boxes"] & infence_dict["totalBoxes"] > 0 ):
@@ -477,7 +492,7 @@ async def new_correction_inference_feedback(cursor,inference_dict, type: int = 1
                 if not (inference_metadata.compare_object_metadata(box_metadata, object_metadata["box"])):
                     # Update the object metadata
                     # flag_box_metadata = True
-                    inference.set_object_box_metadata(cursor, box_id, json.dumps(box_metadata))
+                    inference.set_object_box_metadata(cursor, box_id, box_metadata)
                 
                 # Check if the seed is known
                 if seed_id == "":
@@ -536,32 +551,30 @@ async def new_perfect_inference_feeback(cursor, inference_id, user_id, boxes_id)
     """
     try:
         # Check if user exists
-        if not user.is_a_user_id(cursor=cursor, user_id=user_id):
+        if not validator.is_valid_uuid(user_id) or not user.is_a_user_id(cursor=cursor, user_id=user_id):
             raise user.UserNotFoundError(
                 f"User not found based on the given id: {user_id}"
             )
+        user_id = uuid.UUID(str(user_id))
         # Check if boxes_id exists
         for box_id in boxes_id :
-            if not inference.check_inference_object_exist(cursor, box_id):
+            if not validator.is_valid_uuid(box_id) or not inference.check_inference_object_exist(cursor, box_id):
                 raise inference.InferenceObjectNotFoundError(
                     f"Error: could not get inference object for id {box_id}"
                 )
         # Check if inference exists
-        if not inference.check_inference_exist(cursor, inference_id):
+        if not validator.is_valid_uuid(inference_id) or not inference.check_inference_exist(cursor, inference_id):
             raise inference.InferenceNotFoundError(
                 f"Inference not found based on the given id: {inference_id}"
             )
+        inference_id = uuid.UUID(str(inference_id))
         
         if inference.is_inference_verified(cursor, inference_id):
             raise inference.InferenceAlreadyVerifiedError(
                 f"Can't add feedback to a verified inference, id: {inference_id}"
             )
         
-        for object_id in boxes_id:
-            top_inference_id = inference.get_inference_object_top_id(cursor, object_id)
-            inference.set_inference_object_verified_id(cursor, object_id, top_inference_id )
-            inference.set_inference_object_valid(cursor, object_id, True)
-            
+        inference.set_inference_objects_verified_top_id_batch(cursor, boxes_id)
         inference.verify_inference_status(cursor, inference_id, user_id)
         
     except (user.UserNotFoundError, inference.InferenceObjectNotFoundError, inference.InferenceNotFoundError, inference.InferenceAlreadyVerifiedError) as e:
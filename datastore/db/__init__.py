@@ -1,8 +1,11 @@
 """ 
 This module contains the function interacting with the database directly.
 """
+import functools
 import os
 import psycopg
+from psycopg.types.json import JsonDumper
+from psycopg_pool import ConnectionPool
 
 NACHET_DB_URL = os.environ.get("NACHET_DB_URL")
 if NACHET_DB_URL is None or NACHET_DB_URL == "":
@@ -20,6 +23,9 @@ FERTISCAN_SCHEMA = os.environ.get("FERTISCAN_SCHEMA")
 if FERTISCAN_SCHEMA is None or FERTISCAN_SCHEMA == "":
     raise ValueError("FERTISCAN_SCHEMA is not set")
 
+# Python dicts are sent as json parameters, no need to json.dumps them first
+psycopg.adapters.register_dumper(dict, JsonDumper)
+
 # def connect_db():
 #     """Connect to the postgresql database and return the connection."""
 #     connection = psycopg.connect(
@@ -46,6 +52,67 @@ def connect_db(conn_str : str = NACHET_DB_URL, schema :str  = NACHET_SCHEMA):
     return connection
 
 
+_POOL = None
+
+
+class PoolNotInitializedError(Exception):
+    pass
+
+
+def init_pool(conn_str: str = NACHET_DB_URL, schema: str = NACHET_SCHEMA, min_size: int = 5, max_size: int = 50):
+    """
+    Open the connection pool used by the queries called without a cursor.
+
+    Parameters:
+    - conn_str (str): The connection string of the database.
+    - schema (str): The schema to set in the search_path of the connections.
+    - min_size (int): The number of connections kept open by the pool.
+    - max_size (int): The maximum number of connections of the pool.
+    """
+    global _POOL
+    if _POOL is not None:
+        _POOL.close()
+    _POOL = ConnectionPool(
+        conninfo=conn_str,
+        min_size=min_size,
+        max_size=max_size,
+        open=True,
+        kwargs={
+            "autocommit": False,
+            "options": f"-c search_path={schema},public",
+        },
+    )
+    return _POOL
+
+
+def close_pool():
+    """Close the connection pool opened by init_pool."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.close()
+        _POOL = None
+
+
+def with_cursor(function):
+    """
+    Decorator for the query functions taking a cursor as first argument.
+
+    When the cursor is None, a connection is checked out of the pool for the
+    duration of the call and the transaction is committed, or rolled back if
+    the query raises, before the connection is returned to the pool.
+    """
+    @functools.wraps(function)
+    def wrapper(cursor, *args, **kwargs):
+        if cursor is not None:
+            return function(cursor, *args, **kwargs)
+        if _POOL is None:
+            raise PoolNotInitializedError("Error: the connection pool is not initialized")
+        with _POOL.connection() as connection:
+            with connection.cursor() as pool_cursor:
+                return function(pool_cursor, *args, **kwargs)
+    return wrapper
+
+
 def cursor(connection):
     """Return a cursor for the given connection."""
     return connection.cursor()
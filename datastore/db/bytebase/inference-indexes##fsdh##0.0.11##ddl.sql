@@ -0,0 +1,13 @@
+-- txn-mode = off
+--Index creation nachet_0.0.11
+--CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+
+-- get_objects_by_inference and verify_inference_status filter the objects on inference_id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "idx_object_inference_id"
+    ON "nachet_0.0.11"."object" ("inference_id")
+    INCLUDE ("id", "type_id", "verified_id", "valid", "top_id");
+
+-- get_seed_object_id and the joins from object to seed_obj filter on object_id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "idx_seed_obj_object_id"
+    ON "nachet_0.0.11"."seed_obj" ("object_id")
+    INCLUDE ("id", "seed_id", "score");
@@ -1,17 +1,15 @@
 """
 This module contains the function to generate the metadata necessary to interact with the database and the other layers of Nachet for all the inference related objects. 
-The metadata is generated in a json format and is used to store the metadata in the database.
+The metadata is generated as dicts, sent to the json columns of the database as is.
 
 """
 
-import json
-
 
 class MissingKeyError(Exception):
     pass
 
 
-def build_inference_import(model_inference: dict) -> str:
+def build_inference_import(model_inference: dict) -> dict:
     """
     This funtion build an inference json object from the model inference.
     This serves as the metadata for the inference object in the database.
@@ -20,26 +18,23 @@ def build_inference_import(model_inference: dict) -> str:
     - model_inference: (dict) The model inference object.
 
     Returns:
-    - The inference db object in a string format.
+    - The inference db object.
     """
-    try:
-        if "filename" not in model_inference:
-            raise MissingKeyError("filename")
-        if "labelOccurrence" not in model_inference:
-            raise MissingKeyError("labelOccurrence")
-        if "totalBoxes" not in model_inference:
-            raise MissingKeyError("totalBoxes")
-        inference = {
-            "filename": model_inference["filename"],
-            "labelOccurrence": model_inference["labelOccurrence"],
-            "totalBoxes": model_inference["totalBoxes"],
-        }
-        return json.dumps(inference)
-    except MissingKeyError as e:
-        raise MissingKeyError(f"Missing key: {e}")
+    if "filename" not in model_inference:
+        raise MissingKeyError("Missing key: filename")
+    if "labelOccurrence" not in model_inference:
+        raise MissingKeyError("Missing key: labelOccurrence")
+    if "totalBoxes" not in model_inference:
+        raise MissingKeyError("Missing key: totalBoxes")
+    inference = {
+        "filename": model_inference["filename"],
+        "labelOccurrence": model_inference["labelOccurrence"],
+        "totalBoxes": model_inference["totalBoxes"],
+    }
+    return inference
 
 
-def build_object_import(object: dict) -> str:
+def build_object_import(object: dict) -> dict:
     """
     This function build the object from the model inference object.
     This serves as the metadata for the object in the database.
@@ -48,7 +43,7 @@ def build_object_import(object: dict) -> str:
     - object: (dict) The object from the model inference object.
 
     Returns:
-    - The object db object in a string format.
+    - The object db object.
     """
     data = {
         "box": object["box"],
@@ -56,7 +51,7 @@ def build_object_import(object: dict) -> str:
         "overlapping": object["overlapping"],
         "overlappingIndices": object["overlappingIndices"],
     }
-    return json.dumps(data)
+    return data
 
 def compare_object_metadata(object1:dict , object2:dict) -> bool:
     """
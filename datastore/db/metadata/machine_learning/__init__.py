@@ -2,13 +2,97 @@
 This module contains all the functions and classes that are used to store and retrieve metadata for machine learning models.
 """
 
-import json
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    _dumps = json.dumps
 
 
 class MissingKeyError(Exception):
     pass
 
 
+_PIPELINE_KEYS = (
+    "models",
+    "created_by",
+    "creation_date",
+    "description",
+    "job_name",
+    "version",
+    "dataset",
+    # "Accuracy",
+)
+_PIPELINE_KEY_SET = frozenset(_PIPELINE_KEYS)
+
+
+def _build_pipeline(data: dict) -> dict:
+    """
+    Build the pipeline db dict, with the keys of _PIPELINE_KEYS in order.
+    """
+    try:
+        return {
+            "models": data["models"],
+            "created_by": data["created_by"],
+            "creation_date": data["creation_date"],
+            "description": data["description"],
+            "job_name": data["job_name"],
+            "version": data["version"],
+            "dataset": data["dataset"],
+        }
+    except KeyError as e:
+        raise MissingKeyError(f"Missing key: {e.args[0]}") from e
+
+
+_MODEL_KEYS = (
+    "endpoint",
+    "api_key",
+    "content_type",
+    "deployment_platform",
+    "created_by",
+    "creation_date",
+    "description",
+    "version",
+    "job_name",
+    # "Accuracy",
+    "dataset",
+)
+_MODEL_KEY_SET = frozenset(_MODEL_KEYS)
+
+
+def _build_model(data: dict) -> dict:
+    """
+    Build the model db dict, with the keys of _MODEL_KEYS in order.
+    """
+    try:
+        return {
+            "endpoint": data["endpoint"],
+            "api_key": data["api_key"],
+            "content_type": data["content_type"],
+            "deployment_platform": data["deployment_platform"],
+            "created_by": data["created_by"],
+            "creation_date": data["creation_date"],
+            "description": data["description"],
+            "version": data["version"],
+            "job_name": data["job_name"],
+            "dataset": data["dataset"],
+        }
+    except KeyError as e:
+        raise MissingKeyError(f"Missing key: {e.args[0]}") from e
+
+
+# the builders must stay in sync with the key lists
+_SAMPLE = {key: None for key in _PIPELINE_KEYS + _MODEL_KEYS}
+assert tuple(_build_pipeline(_SAMPLE)) == _PIPELINE_KEYS
+assert tuple(_build_model(_SAMPLE)) == _MODEL_KEYS
+del _SAMPLE
+
+
 def build_pipeline_import(pipeline: dict) -> str:
     """
     This function builds the model metadata for the database.
@@ -19,38 +103,14 @@ def build_pipeline_import(pipeline: dict) -> str:
     Returns:
     - The model db object in a string format.
     """
-    try:
-        keys = [
-            "models",
-            "created_by",
-            "creation_date",
-            "description",
-            "job_name",
-            "version",
-            "dataset",
-        ]
-
-        for key in keys:
-            if key not in pipeline:
-                raise MissingKeyError(key)
-
-        pipeline_db = {
-            "models": pipeline["models"],
-            "created_by": pipeline["created_by"],
-            "creation_date": pipeline["creation_date"],
-            "description": pipeline["description"],
-            "job_name": pipeline["job_name"],
-            "version": pipeline["version"],
-            "dataset": pipeline["dataset"],
-            # "Accuracy": pipeline["Accuracy"]
-        }
-        return json.dumps(pipeline_db)
-    except MissingKeyError as e:
-        raise MissingKeyError(f"Missing key: {e}")
+    if pipeline.keys() == _PIPELINE_KEY_SET:
+        # already the db object, no need to copy it
+        return _dumps(pipeline)
+    return _dumps(_build_pipeline(pipeline))
 
 
 def build_pipeline_export(
-    data: dict, name: str, id: str, default: bool, model_ids
+    data: dict, name: str, id, default: bool, model_ids
 ) -> dict:
     """
     This function builds the model metadata for the database.
@@ -61,16 +121,14 @@ def build_pipeline_export(
     Returns:
     - The model db object in a string format.
     """
-    pipeline_db = {
+    return {
         "models": model_ids,
         "pipeline_id": str(id),
         "pipeline_name": name,
         "model_name": name,
         "default": default,
+        **data,
     }
-    for key in data:
-        pipeline_db[key] = data[key]
-    return pipeline_db
 
 
 def build_model_import(model: dict) -> str:
@@ -83,44 +141,14 @@ def build_model_import(model: dict) -> str:
     Returns:
     - The model db object in a string format.
     """
-    try:
-        keys = [
-            "endpoint",
-            "api_key",
-            "content_type",
-            "deployment_platform",
-            "created_by",
-            "creation_date",
-            "description",
-            "version",
-            "job_name",
-            "dataset",
-        ]
-
-        for key in keys:
-            if key not in model:
-                raise MissingKeyError(key)
-
-        model_db = {
-            "endpoint": model["endpoint"],
-            "api_key": model["api_key"],
-            "content_type": model["content_type"],
-            "deployment_platform": model["deployment_platform"],
-            "created_by": model["created_by"],
-            "creation_date": model["creation_date"],
-            "description": model["description"],
-            "version": model["version"],
-            "job_name": model["job_name"],
-            # "Accuracy": model["Accuracy"],
-            "dataset": model["dataset"],
-        }
-        return json.dumps(model_db)
-    except MissingKeyError as e:
-        raise MissingKeyError(f"Missing key: {e}")
+    if model.keys() == _MODEL_KEY_SET:
+        # already the db object, no need to copy it
+        return _dumps(model)
+    return _dumps(_build_model(model))
 
 
 def build_model_export(
-    data: dict, id, name: str, endpoint: str, task_name: str, version: str
+    data: dict | None, id, name: str, endpoint: str, task_name: str, version
 ) -> dict:
     """
     This function builds the model metadata for the database.
@@ -131,14 +159,13 @@ def build_model_export(
     Returns:
     - The model db object in a string format.
     """
-    model_db = {
+    if data is None:
+        data = {}
+    return {
         "model_id": str(id),
         "model_name": name,
         "endpoint": endpoint,
         "task": task_name,
         "version": version,
+        **data,
     }
-    if data is not None:
-        for key in data.keys():
-            model_db[key] = data[key]
-    return model_db
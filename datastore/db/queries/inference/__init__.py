@@ -1,7 +1,20 @@
 """
 This module contains the queries related to the inference related tables.
 
+The queries on the objects of an inference rely on these indexes, created by
+datastore/db/bytebase/inference-indexes##fsdh##0.0.11##ddl.sql:
+- idx_object_inference_id: object(inference_id) INCLUDE (id, type_id,
+    verified_id, valid, top_id)
+- idx_seed_obj_object_id: seed_obj(object_id) INCLUDE (id, seed_id, score)
 """
+import copy
+import json
+import threading
+import uuid
+from cachetools import TTLCache
+from psycopg import sql
+from psycopg.pq import TransactionStatus
+from datastore.db import with_cursor
 
 class InferenceCreationError(Exception):
     pass
@@ -17,24 +30,45 @@ class InferenceObjectNotFoundError(Exception):
 
 class InferenceAlreadyVerifiedError(Exception):
     pass
+
+_CACHE_MAXSIZE = 10_000
+_CACHE_TTL = 300
+_inference_cache = TTLCache(maxsize=_CACHE_MAXSIZE, ttl=_CACHE_TTL)
+# TTLCache is not thread safe and the pool connections can be used by many threads
+_cache_lock = threading.Lock()
+
+def _cache_get(key):
+    with _cache_lock:
+        return _inference_cache.get(key)
+
+def _cache_set(key, value):
+    with _cache_lock:
+        _inference_cache[key] = value
+
+def _cache_pop(key):
+    with _cache_lock:
+        _inference_cache.pop(_as_uuid(key), None)
 """
 
 INFERENCE TABLE QUERIES
 
 """
 
-def new_inference(cursor, inference, user_id: str, picture_id:str,type):
+@with_cursor
+def new_inference(cursor, inference: dict, user_id: uuid.UUID, picture_id: uuid.UUID, type):
     """
     This function uploads a new inference to the database.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
-    - inference (str): The inference to upload. Must be formatted as a json
-    - user_id (str): The UUID of the user uploading.
-    - picture_id (str): The UUID of the picture the inference is related to.
+    - inference (dict): The inference to upload. A json string is also accepted.
+    - user_id (uuid.UUID): The UUID of the user uploading.
+    - picture_id (uuid.UUID): The UUID of the picture the inference is related to.
 
     Returns:
     - The inference dict with the UUIDs of the inference, boxes and topN.
+
+    To upload an inference with its objects, use create_inference_tree instead.
     """
     try:
         query = """
@@ -52,27 +86,174 @@ def new_inference(cursor, inference, user_id: str, picture_id:str,type):
             query,
             (
                 inference,
-                picture_id,
-                user_id,
+                _as_uuid(picture_id),
+                _as_uuid(user_id),
             ),
         )
         inference_id=cursor.fetchone()[0]
         return inference_id
-    except Exception:
-        raise InferenceCreationError("Error: inference not uploaded")
+    except Exception as e:
+        raise InferenceCreationError("Error: inference not uploaded") from e
+
+
+@with_cursor
+def create_inference_tree(cursor, inference: dict, user_id: uuid.UUID, picture_id: uuid.UUID, objects: list):
+    """
+    This function uploads an inference with all its objects and seed objects
+    (seed predictions) to the database in a single query.
+
+    The UUIDs of the objects and seed objects are generated beforehand so the
+    whole tree can be inserted at once. The top_id of each object is set to
+    its seed object with the highest score.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - inference (dict): The inference to upload. A json string is also accepted.
+    - user_id (uuid.UUID): The UUID of the user uploading.
+    - picture_id (uuid.UUID): The UUID of the picture the inference is related to.
+    - objects (list): The objects of the inference. Each object is a dict with
+        the keys box_metadata (dict or json str), type_id (int), manual_detection
+        (bool, optional) and seeds, a list of dict with the keys seed_id and
+        score. The keys id and top_id are added to each object and the key id
+        to each seed.
+
+    Returns:
+    - The UUID of the inference.
+    """
+    try:
+        objects_rows = []
+        seeds_rows = []
+        for obj in objects:
+            obj["id"] = str(uuid.uuid4())
+            obj["top_id"] = None
+            top_score = -1
+            for seed_obj in obj["seeds"]:
+                seed_obj["id"] = str(uuid.uuid4())
+                if seed_obj["score"] > top_score:
+                    top_score = seed_obj["score"]
+                    obj["top_id"] = seed_obj["id"]
+                seeds_rows.append(
+                    {
+                        "id": seed_obj["id"],
+                        "seed_id": str(seed_obj["seed_id"]),
+                        "object_id": obj["id"],
+                        "score": seed_obj["score"],
+                    }
+                )
+            objects_rows.append(
+                {
+                    "id": obj["id"],
+                    "box_metadata": _as_json(obj["box_metadata"]),
+                    "type_id": obj["type_id"],
+                    "manual_detection": obj.get("manual_detection", False),
+                    "top_id": obj["top_id"],
+                }
+            )
+        query = """
+            WITH ins_inference AS (
+                INSERT INTO 
+                    inference(
+                        inference,
+                        picture_id,
+                        user_id
+                        )
+                VALUES
+                    (%s,%s,%s)
+                RETURNING id
+            ), ins_object AS (
+                INSERT INTO 
+                    object(
+                        id,
+                        inference_id,
+                        box_metadata,
+                        type_id,
+                        manual_detection,
+                        top_id
+                        )
+                SELECT 
+                    o.id,
+                    ins_inference.id,
+                    o.box_metadata::json,
+                    o.type_id,
+                    o.manual_detection,
+                    o.top_id
+                FROM 
+                    ins_inference,
+                    jsonb_to_recordset(%s::jsonb) AS o(
+                        id uuid,
+                        box_metadata jsonb,
+                        type_id integer,
+                        manual_detection boolean,
+                        top_id uuid
+                        )
+            ), ins_seed_obj AS (
+                INSERT INTO 
+                    seed_obj(
+                        id,
+                        seed_id,
+                        object_id,
+                        score
+                        )
+                SELECT 
+                    so.id,
+                    so.seed_id,
+                    so.object_id,
+                    so.score
+                FROM 
+                    jsonb_to_recordset(%s::jsonb) AS so(
+                        id uuid,
+                        seed_id uuid,
+                        object_id uuid,
+                        score float
+                        )
+            )
+            SELECT 
+                id
+            FROM 
+                ins_inference
+            """
+        cursor.execute(
+            query,
+            (
+                inference,
+                _as_uuid(picture_id),
+                _as_uuid(user_id),
+                json.dumps(objects_rows),
+                json.dumps(seeds_rows),
+            ),
+        )
+        return cursor.fetchone()[0]
+    except Exception as e:
+        raise InferenceCreationError("Error: inference tree not uploaded") from e
 
 
-def get_inference(cursor, inference_id: str):
+def get_inference(cursor, inference_id: uuid.UUID):
     """
     This function gets an inference from the database.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
-    - inference_id (str): The UUID of the inference.
+    - inference_id (uuid.UUID): The UUID of the inference.
 
     Returns:
     - The inference.
     """
+    try:
+        key = _as_uuid(inference_id)
+    except ValueError as e:
+        raise InferenceNotFoundError(f"Error: could not get inference {inference_id}") from e
+    # look in the cache before a pool connection is checked out
+    res = _cache_get(key)
+    if res is None:
+        res = _fetch_inference(cursor, key)
+    # the callers get their own copy, the cached one must not be mutated
+    return copy.deepcopy(res)
+
+@with_cursor
+def _fetch_inference(cursor, key):
+    """
+    Read the inference from the database and cache it when it is committed.
+    """
     try:
         query = """
             SELECT 
@@ -82,20 +263,28 @@ def get_inference(cursor, inference_id: str):
             WHERE 
                 id = %s
             """
-        cursor.execute(query, (inference_id,))
+        # without a transaction open, the read can only see a committed row
+        committed = cursor.connection.info.transaction_status == TransactionStatus.IDLE
+        cursor.execute(query, (key,), prepare=True)
         res = cursor.fetchone()[0]
+        if committed:
+            _cache_set(key, res)
         return res
-    except Exception:
-        raise InferenceNotFoundError(f"Error: could not get inference {inference_id}")
+    except Exception as e:
+        raise InferenceNotFoundError(f"Error: could not get inference {key}") from e
 
+@with_cursor
 def set_inference_feedback_user_id(cursor, inference_id, user_id):
     """
     This function sets the feedback_user_id of an inference.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
-    - inference_id (str): The UUID of the inference.
-    - user_id (str): The UUID of the user.
+    - inference_id (uuid.UUID): The UUID of the inference.
+    - user_id (uuid.UUID): The UUID of the user.
+
+    Returns:
+    - The updated (id, feedback_user_id, verified) row of the inference.
     """
     try:
         query = """
@@ -105,19 +294,26 @@ def set_inference_feedback_user_id(cursor, inference_id, user_id):
                 feedback_user_id = %s
             WHERE 
                 id = %s
+            RETURNING
+                id,
+                feedback_user_id,
+                verified
             """
-        cursor.execute(query, (user_id,inference_id))
-    except Exception:
-        raise Exception(f"Error: could not set feedback_user_id {user_id} for inference {inference_id}")
+        cursor.execute(query, (_as_uuid(user_id),_as_uuid(inference_id)), prepare=True)
+        _cache_pop(inference_id)
+        return cursor.fetchone()
+    except Exception as e:
+        raise Exception(f"Error: could not set feedback_user_id {user_id} for inference {inference_id}") from e
     
 
+@with_cursor
 def set_inference_verified(cursor, inference_id, is_verified):
     """
     This function sets the inference as verified or not.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
-    - inference_id (str): The UUID of the inference.
+    - inference_id (uuid.UUID): The UUID of the inference.
     - is_verified (bool): is the inference verified.
     """
     try:
@@ -129,10 +325,12 @@ def set_inference_verified(cursor, inference_id, is_verified):
             WHERE 
                 id = %s
             """
-        cursor.execute(query, (is_verified,inference_id))
-    except Exception:
-        raise Exception(f"Error: could not update verified {is_verified} for inference {inference_id}")
+        cursor.execute(query, (is_verified,_as_uuid(inference_id)), prepare=True)
+        _cache_pop(inference_id)
+    except Exception as e:
+        raise Exception(f"Error: could not update verified {is_verified} for inference {inference_id}") from e
     
+@with_cursor
 def is_inference_verified(cursor, inference_id):
     """
     Check if an inference is verified or not.
@@ -148,12 +346,13 @@ def is_inference_verified(cursor, inference_id):
             WHERE 
                 id = %s
             """
-        cursor.execute(query, (str(inference_id),))
+        cursor.execute(query, (_as_uuid(inference_id),), prepare=True)
         res = cursor.fetchone()[0]
         return res
-    except Exception:
-        raise Exception(f"Error: could not select verified column for inference {inference_id}")
+    except Exception as e:
+        raise Exception(f"Error: could not select verified column for inference {inference_id}") from e
 
+@with_cursor
 def is_object_verified(cursor, object_id):
     """
     Check if an object is verified or not.
@@ -169,23 +368,25 @@ def is_object_verified(cursor, object_id):
             WHERE 
                 id = %s
             """
-        cursor.execute(query, (str(object_id),))
+        cursor.execute(query, (_as_uuid(object_id),), prepare=True)
         res = cursor.fetchone()[0]
         return (res is not None)
     except ValueError:
         return False
-    except Exception:
-        raise Exception(f"Error: could not select verified_id column for object {object_id}")
+    except Exception as e:
+        raise Exception(f"Error: could not select verified_id column for object {object_id}") from e
 
+@with_cursor
 def verify_inference_status(cursor, inference_id, user_id):
     """
     Set inference verified if inference is fully verified and set the user as the feedback user
     """
-    objects = get_objects_by_inference(cursor, inference_id)
-    if all(obj[4] is not None for obj in objects) :
+    objects = get_objects_by_inference(cursor, inference_id, columns=("verified_id",))
+    if all(obj[0] is not None for obj in objects) :
         set_inference_feedback_user_id(cursor, inference_id, user_id)
         set_inference_verified(cursor, inference_id, True)
 
+@with_cursor
 def check_inference_exist(cursor, inference_id):
     """
     Check if an inference exists in the database.
@@ -201,11 +402,11 @@ def check_inference_exist(cursor, inference_id):
             WHERE 
                 id = %s
             """
-        cursor.execute(query, (str(inference_id),))
+        cursor.execute(query, (_as_uuid(inference_id),), prepare=True)
         res = cursor.fetchone()
         return res is not None
-    except Exception:
-        raise Exception(f"Error: could not check if inference {inference_id} exists")
+    except Exception as e:
+        raise Exception(f"Error: could not check if inference {inference_id} exists") from e
     
 """
 
@@ -213,18 +414,42 @@ OBJECT TABLE QUERIES
 
 """
 
-def new_inference_object(cursor, inference_id: str,box_metadata:str,type_id:int,manual_detection:bool=False):
+@with_cursor
+def new_inference_object(cursor, inference_id: uuid.UUID,box_metadata:dict,type_id:int,manual_detection:bool=False):
     """
     This function uploads a new inference object to the database.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
-    - inference_id (str): The UUID of the inference.
+    - inference_id (uuid.UUID): The UUID of the inference.
+    - box_metadata (dict): The metadata of the box. A json string is also accepted.
     - type_id (int): The UUID of the type.
 
     Returns:
     - The UUID of the inference object.
+
+    To upload an inference with its objects, use create_inference_tree instead.
+    """
+    return new_inference_objects_batch(
+        cursor, inference_id, [(box_metadata, type_id, manual_detection)]
+    )[0]
+
+@with_cursor
+def new_inference_objects_batch(cursor, inference_id: uuid.UUID, objects: list):
     """
+    This function uploads all the objects of an inference to the database
+    in a single batch.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - inference_id (uuid.UUID): The UUID of the inference.
+    - objects (list): The (box_metadata, type_id, manual_detection) tuples to upload.
+
+    Returns:
+    - The list of the UUIDs of the inference objects, in the same order as objects.
+    """
+    if len(objects) == 0:
+        return []
     try:
         query = """
             INSERT INTO 
@@ -238,92 +463,208 @@ def new_inference_object(cursor, inference_id: str,box_metadata:str,type_id:int,
                 (%s,%s,%s,%s)
             RETURNING id    
             """
-        cursor.execute(
+        inference_id = _as_uuid(inference_id)
+        cursor.executemany(
             query,
-            (
-                inference_id,
-                box_metadata,
-                type_id,
-                manual_detection,
-            ),
+            [
+                (inference_id, box_metadata, type_id, manual_detection)
+                for box_metadata, type_id, manual_detection in objects
+            ],
+            returning=True,
         )
-        return cursor.fetchone()[0]
-    except Exception:
-        raise InferenceCreationError("Error: inference object not uploaded")
+        return _fetch_returned_ids(cursor)
+    except Exception as e:
+        raise InferenceCreationError("Error: inference object not uploaded") from e
+
+OBJECT_COLUMNS = (
+    "id",
+    "box_metadata",
+    "inference_id",
+    "type_id",
+    "verified_id",
+    "valid",
+    "top_id",
+    "upload_date",
+    "updated_at",
+    "manual_detection",
+)
 
-def get_inference_object(cursor, inference_object_id: str):
+# Column order returned by get_inference_object, relied upon by the callers
+INFERENCE_OBJECT_COLUMNS = (
+    "id",
+    "box_metadata",
+    "inference_id",
+    "type_id",
+    "verified_id",
+    "top_id",
+    "valid",
+    "top_id",
+    "upload_date",
+    "updated_at",
+)
+
+# Size of the blocks read from the file by import_objects_binary
+COPY_BLOCK_SIZE = 64 * 1024
+
+def _object_columns(columns):
+    """
+    Build the projection of a query on the object table from a list of column names.
+    """
+    unknown = set(columns).difference(OBJECT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Error: unknown object columns {sorted(unknown)}")
+    return sql.SQL(",").join(sql.Identifier(column) for column in columns)
+
+@with_cursor
+def get_inference_object(cursor, inference_object_id: str, columns=INFERENCE_OBJECT_COLUMNS):
     """
         This function gets an object from the database.
 
         Parameters:
         - cursor (cursor): The cursor of the database.
         - inference_object_id (str): The UUID of the object.
+        - columns (list): The columns to select, among OBJECT_COLUMNS.
 
         Returns:
         - The object.
     """
+    projection = _object_columns(columns)
     try:
-        query = """
+        query = sql.SQL("""
             SELECT 
-                id,
-                box_metadata,
-                inference_id,
-                type_id,
-                verified_id,
-                top_id,
-                valid,
-                top_id,
-                upload_date,
-                updated_at
+                {projection}
             FROM 
                 object
             WHERE 
                 id = %s
-            """
-        cursor.execute(query, (inference_object_id,))
+            """).format(projection=projection)
+        cursor.execute(query, (_as_uuid(inference_object_id),), prepare=True)
         res = cursor.fetchone()
         if res is None:
             raise Exception(f"Error: could not find inference object for id {inference_object_id}")
         return res
-    except Exception:
-        raise InferenceObjectNotFoundError(f"Error: could not get inference object for id {inference_object_id}")
+    except Exception as e:
+        raise InferenceObjectNotFoundError(f"Error: could not get inference object for id {inference_object_id}") from e
 
-def get_objects_by_inference(cursor, inference_id: str):
+def get_objects_by_inference(cursor, inference_id: uuid.UUID, columns=OBJECT_COLUMNS, server_cursor: bool = False):
     """
     This function gets all objects from the database related to an inference.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
-    - inference_id (str): The UUID of the inference.
+    - inference_id (uuid.UUID): The UUID of the inference.
+    - columns (list): The columns to select, among OBJECT_COLUMNS.
+    - server_cursor (bool): Stream the objects from a server side cursor
+        instead of fetching them all at once. The connection of the cursor
+        must stay open until the objects are consumed, so a cursor must be
+        given: a pool connection is returned before the objects are read.
 
     Returns:
-    - The objects.
+    - The objects, or an iterator over the objects if server_cursor is True.
+    """
+    if server_cursor and cursor is None:
+        raise ValueError("Error: server_cursor requires the cursor of an open connection")
+    return _get_objects_by_inference(cursor, inference_id, columns, server_cursor)
+
+@with_cursor
+def _get_objects_by_inference(cursor, inference_id, columns, server_cursor):
     """
+    Run the query of get_objects_by_inference.
+    """
+    projection = _object_columns(columns)
     try:
-        query = """
+        query = sql.SQL("""
             SELECT 
-                *
+                {projection}
             FROM 
                 object
             WHERE 
                 inference_id = %s
-            """
-        cursor.execute(query, (inference_id,))
+            """).format(projection=projection)
+        if server_cursor:
+            named_cursor = cursor.connection.cursor(name=f"objects_{uuid.uuid4().hex}")
+            named_cursor.itersize = 500
+            named_cursor.execute(query, (_as_uuid(inference_id),))
+            return _stream_rows(named_cursor)
+        cursor.execute(query, (_as_uuid(inference_id),), prepare=True)
         res = cursor.fetchall()
         if res is None:
             raise Exception(f"Error: could not find objects for inference {inference_id}")
         return res
-    except Exception:
-        raise InferenceObjectNotFoundError(f"Error: could not get objects for inference {inference_id}")
+    except Exception as e:
+        raise InferenceObjectNotFoundError(f"Error: could not get objects for inference {inference_id}") from e
+
+def _stream_rows(named_cursor):
+    """
+    Yield the rows of a server side cursor and close it once consumed.
+    """
+    with named_cursor:
+        yield from named_cursor
 
-def set_inference_object_top_id(cursor, inference_object_id: str, top_id:str):
+@with_cursor
+def export_objects_binary(cursor, inference_ids: list, fileobj, columns=OBJECT_COLUMNS):
+    """
+    This function exports the objects of many inferences with COPY in the
+    PostgreSQL binary format. The rows are written to fileobj as they are
+    received instead of being loaded in memory.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - inference_ids (list): The UUIDs of the inferences.
+    - fileobj (file): The binary file object to write the objects to.
+    - columns (list): The columns to export, among OBJECT_COLUMNS.
+    """
+    projection = _object_columns(columns)
+    try:
+        query = sql.SQL("""
+            COPY (
+                SELECT 
+                    {projection}
+                FROM 
+                    object
+                WHERE 
+                    inference_id = ANY(%s)
+            ) TO STDOUT (FORMAT BINARY)
+            """).format(projection=projection)
+        with cursor.copy(query, ([_as_uuid(id) for id in inference_ids],)) as copy:
+            for data in copy:
+                fileobj.write(data)
+    except Exception as e:
+        raise Exception("Error: could not export the objects") from e
+
+@with_cursor
+def import_objects_binary(cursor, fileobj, columns=OBJECT_COLUMNS):
+    """
+    This function imports objects exported by export_objects_binary with COPY.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - fileobj (file): The binary file object to read the objects from.
+    - columns (list): The exported columns, in the same order as the export.
+    """
+    projection = _object_columns(columns)
+    try:
+        query = sql.SQL("""
+            COPY object ({projection}) FROM STDIN (FORMAT BINARY)
+            """).format(projection=projection)
+        with cursor.copy(query) as copy:
+            while data := fileobj.read(COPY_BLOCK_SIZE):
+                copy.write(data)
+    except Exception as e:
+        raise InferenceCreationError("Error: objects not imported") from e
+
+@with_cursor
+def set_inference_object_top_id(cursor, inference_object_id: str, top_id: uuid.UUID):
     """
     This function sets the top_id of an inference.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
     - inference_id (str): The UUID of the inference.
-    - top_id (str): The UUID of the top.
+    - top_id (uuid.UUID): The UUID of the top.
+
+    Returns:
+    - The updated (top_id,) row of the object.
     """
     try:
         query = """
@@ -333,11 +674,15 @@ def set_inference_object_top_id(cursor, inference_object_id: str, top_id:str):
                 top_id = %s
             WHERE 
                 id = %s
+            RETURNING
+                top_id
             """
-        cursor.execute(query, (top_id,inference_object_id))
-    except Exception:
-        raise Exception(f"Error: could not set top_id {top_id} for inference {inference_object_id}")
+        cursor.execute(query, (_as_uuid(top_id),_as_uuid(inference_object_id)), prepare=True)
+        return cursor.fetchone()
+    except Exception as e:
+        raise Exception(f"Error: could not set top_id {top_id} for inference {inference_object_id}") from e
     
+@with_cursor
 def get_inference_object_top_id(cursor, inference_object_id: str):
     """
     This function gets the top_id of an inference.
@@ -358,21 +703,25 @@ def get_inference_object_top_id(cursor, inference_object_id: str):
             WHERE 
                 id = %s
             """
-        cursor.execute(query, (inference_object_id,))
+        cursor.execute(query, (_as_uuid(inference_object_id),), prepare=True)
         res = cursor.fetchone()[0]
         return res
-    except Exception:
-        raise Exception(f"Error: could not get top_inference_id for inference {inference_object_id}")
+    except Exception as e:
+        raise Exception(f"Error: could not get top_inference_id for inference {inference_object_id}") from e
 
 
-def set_inference_object_verified_id(cursor, inference_object_id: str, verified_id:str):
+@with_cursor
+def set_inference_object_verified_id(cursor, inference_object_id: str, verified_id: uuid.UUID):
     """
     This function sets the verified_id of an object.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
     - inference_object_id (str): The UUID of the object.
-    - verified_id (str): The UUID of the verified.
+    - verified_id (uuid.UUID): The UUID of the verified.
+
+    Returns:
+    - The updated (updated_at, verified_id) row of the object.
     """
     try:
         query = """
@@ -383,11 +732,16 @@ def set_inference_object_verified_id(cursor, inference_object_id: str, verified_
                 updated_at = CURRENT_TIMESTAMP
             WHERE 
                 id = %s
+            RETURNING
+                updated_at,
+                verified_id
             """
-        cursor.execute(query, (verified_id,inference_object_id))
-    except Exception:
-        raise Exception(f"Error: could not update verified_id for object {inference_object_id}")
+        cursor.execute(query, (_as_uuid(verified_id),_as_uuid(inference_object_id)), prepare=True)
+        return cursor.fetchone()
+    except Exception as e:
+        raise Exception(f"Error: could not update verified_id for object {inference_object_id}") from e
     
+@with_cursor
 def set_inference_object_valid(cursor, inference_object_id: str, is_valid:bool):
     """
     This function sets the is_valid of an object.
@@ -406,10 +760,138 @@ def set_inference_object_valid(cursor, inference_object_id: str, is_valid:bool):
             WHERE 
                 id = %s
             """
-        cursor.execute(query, (is_valid,inference_object_id))
-    except Exception:
-        raise Exception(f"Error: could not update valid for object {inference_object_id}")
+        cursor.execute(query, (is_valid,_as_uuid(inference_object_id)), prepare=True)
+    except Exception as e:
+        raise Exception(f"Error: could not update valid for object {inference_object_id}") from e
+
+@with_cursor
+def set_inference_objects_top_id_batch(cursor, pairs: list):
+    """
+    This function sets the top_id of many objects in a single query.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - pairs (list): The (inference_object_id, top_id) tuples to set.
+    """
+    try:
+        query = """
+            UPDATE 
+                object
+            SET
+                top_id = data.top_id
+            FROM
+                unnest(%s::uuid[], %s::uuid[]) AS data(id, top_id)
+            WHERE 
+                object.id = data.id
+            """
+        cursor.execute(query, _unzip_pairs(pairs))
+    except Exception as e:
+        raise Exception("Error: could not set top_id for the objects") from e
+
+@with_cursor
+def set_inference_objects_verified_id_batch(cursor, pairs: list):
+    """
+    This function sets the verified_id of many objects in a single query.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - pairs (list): The (inference_object_id, verified_id) tuples to set.
+    """
+    try:
+        query = """
+            UPDATE 
+                object
+            SET
+                verified_id = data.verified_id,
+                updated_at = CURRENT_TIMESTAMP
+            FROM
+                unnest(%s::uuid[], %s::uuid[]) AS data(id, verified_id)
+            WHERE 
+                object.id = data.id
+            """
+        cursor.execute(query, _unzip_pairs(pairs))
+    except Exception as e:
+        raise Exception("Error: could not update verified_id for the objects") from e
+
+@with_cursor
+def set_inference_objects_valid_batch(cursor, pairs: list):
+    """
+    This function sets the is_valid of many objects in a single query.
 
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - pairs (list): The (inference_object_id, is_valid) tuples to set.
+    """
+    try:
+        query = """
+            UPDATE 
+                object
+            SET
+                valid = data.valid
+            FROM
+                unnest(%s::uuid[], %s::boolean[]) AS data(id, valid)
+            WHERE 
+                object.id = data.id
+            """
+        cursor.execute(query, _unzip_pairs(pairs, uuid_values=False))
+    except Exception as e:
+        raise Exception("Error: could not update valid for the objects") from e
+
+@with_cursor
+def set_inference_objects_verified_top_id_batch(cursor, inference_object_ids: list):
+    """
+    This function sets many objects as valid and verified with their top_id,
+    in a single query.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - inference_object_ids (list): The UUIDs of the objects.
+    """
+    try:
+        query = """
+            UPDATE 
+                object
+            SET
+                verified_id = top_id,
+                valid = true,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE 
+                id = ANY(%s::uuid[])
+            """
+        cursor.execute(query, ([_as_uuid(id) for id in inference_object_ids],))
+    except Exception as e:
+        raise Exception("Error: could not verify the objects") from e
+
+def _unzip_pairs(pairs, uuid_values: bool = True):
+    """
+    Split (id, value) pairs into the list of ids and the list of values.
+
+    The ids, and the values when uuid_values is True, are sent as uuid.UUID.
+    """
+    ids = [_as_uuid(pair[0]) for pair in pairs]
+    if uuid_values:
+        values = [_as_uuid(pair[1]) for pair in pairs]
+    else:
+        values = [pair[1] for pair in pairs]
+    return (ids, values)
+
+def _as_json(value):
+    """
+    Return the value as a dict, a json string is decoded.
+    """
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+def _as_uuid(value):
+    """
+    Return the value as a uuid.UUID, None is returned as is.
+    """
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+@with_cursor
 def check_inference_object_exist(cursor, inference_object_id):
     """
     Check if an inference object exists in the database.
@@ -425,11 +907,11 @@ def check_inference_object_exist(cursor, inference_object_id):
                     WHERE id = %s
                 )
             """
-        cursor.execute(query, (str(inference_object_id),))
+        cursor.execute(query, (_as_uuid(inference_object_id),), prepare=True)
         res = cursor.fetchone()
         return res[0]
-    except Exception:
-        raise Exception(f"Error: could not check if inference object {inference_object_id} exists")
+    except Exception as e:
+        raise Exception(f"Error: could not check if inference object {inference_object_id} exists") from e
 
 """
 
@@ -437,6 +919,7 @@ SEED OBJECT TABLE QUERIES
 
 """
 
+@with_cursor
 def new_seed_object(cursor, seed_id: str, object_id:str,score:float):
     """
     This function uploads a new seed object (seed prediction) to the database.
@@ -449,7 +932,26 @@ def new_seed_object(cursor, seed_id: str, object_id:str,score:float):
 
     Returns:
     - The UUID of the seed object.
+
+    To upload an inference with its objects, use create_inference_tree instead.
+    """
+    return new_seed_objects_batch(cursor, [(seed_id, object_id, score)])[0]
+
+@with_cursor
+def new_seed_objects_batch(cursor, rows: list):
     """
+    This function uploads many seed objects (seed predictions) to the database
+    in a single batch.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - rows (list): The (seed_id, object_id, score) tuples to upload.
+
+    Returns:
+    - The list of the UUIDs of the seed objects, in the same order as rows.
+    """
+    if len(rows) == 0:
+        return []
     try:
         query = """
             INSERT INTO 
@@ -462,27 +964,37 @@ def new_seed_object(cursor, seed_id: str, object_id:str,score:float):
                 (%s,%s,%s)
             RETURNING id    
             """
-        cursor.execute(
+        cursor.executemany(
             query,
-            (
-                seed_id,
-                object_id,
-                score,
-            ),
+            [
+                (_as_uuid(seed_id), _as_uuid(object_id), score)
+                for seed_id, object_id, score in rows
+            ],
+            returning=True,
         )
-        return cursor.fetchone()[0]
-    except Exception:
-        raise SeedObjectCreationError("Error: seed object not uploaded")
+        return _fetch_returned_ids(cursor)
+    except Exception as e:
+        raise SeedObjectCreationError("Error: seed object not uploaded") from e
 
+def _fetch_returned_ids(cursor):
+    """
+    Collect the id returned by each statement of an executemany(returning=True).
+    """
+    ids = []
+    while True:
+        ids.append(cursor.fetchone()[0])
+        if not cursor.nextset():
+            return ids
 
-def set_object_box_metadata(cursor,object_id:str, metadata:str):
+@with_cursor
+def set_object_box_metadata(cursor,object_id:str, metadata:dict):
     """
     This function sets the metadata of an object.
 
     Parameters:
     - cursor (cursor): The cursor of the database.
     - object_id (str): The UUID of the object.
-    - metadata (str): The metadata to set.
+    - metadata (dict): The metadata to set. A json string is also accepted.
     """
     try:
         query = """
@@ -493,10 +1005,11 @@ def set_object_box_metadata(cursor,object_id:str, metadata:str):
             WHERE 
                 id = %s
             """
-        cursor.execute(query, (metadata,object_id))
-    except Exception:
-        raise Exception(f"Error: could not set metadata {metadata} for object {object_id}")
+        cursor.execute(query, (metadata,_as_uuid(object_id)), prepare=True)
+    except Exception as e:
+        raise Exception(f"Error: could not set metadata {metadata} for object {object_id}") from e
 
+@with_cursor
 def get_seed_object_id(cursor, seed_id: str, object_id:str):
     """
     This function gets the seed object from the feedback table.
@@ -512,10 +1025,10 @@ def get_seed_object_id(cursor, seed_id: str, object_id:str):
             AND 
                 so.object_id = %s
             """
-        cursor.execute(query, (seed_id,object_id))
+        cursor.execute(query, (_as_uuid(seed_id),_as_uuid(object_id)), prepare=True)
         if cursor.rowcount == 0:
             return None
         res = cursor.fetchone()[0]
         return res
-    except Exception:
-        raise Exception(f"Error: could not get seed_object_id for seed_id {seed_id} for object {object_id}")
+    except Exception as e:
+        raise Exception(f"Error: could not get seed_object_id for seed_id {seed_id} for object {object_id}") from e
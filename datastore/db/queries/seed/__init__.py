@@ -86,6 +86,40 @@ def get_seed_id(cursor, seed_name: str) -> str:
         raise Exception("unhandled error")
 
 
+def get_seed_ids(cursor, seed_names: list) -> dict:
+    """
+    This function retrieve the UUIDs of many seeds in a single query.
+
+    Parameters:
+    - cursor (cursor): The cursor of the database.
+    - seed_names (list): Names of the seeds, matched like get_seed_id does.
+
+    Returns:
+    - A dict of the UUID of each seed by its name.
+    """
+    names = list(dict.fromkeys(seed_names))
+    try:
+        query = """
+            SELECT DISTINCT ON (names.name)
+                names.name,
+                seed.id
+            FROM 
+                unnest(%s::text[]) AS names(name)
+            JOIN
+                seed
+            ON 
+                seed.name ILIKE '%%' || names.name
+            """
+        cursor.execute(query, (names,))
+        result = dict(cursor.fetchall())
+    except Exception:
+        raise Exception("unhandled error")
+    missing = [name for name in names if name not in result]
+    if missing:
+        raise SeedNotFoundError(f"Error: seed not found {missing}")
+    return result
+
+
 def new_seed(cursor, seed_name: str):
     """
     This function inserts a new seed into the database.
@@ -0,0 +1,27 @@
+"""
+Optional compiled build of the datastore.
+
+The package metadata lives in pyproject.toml. When NACHET_MYPYC is set to 1,
+the pure CPU metadata modules are compiled with mypyc:
+
+    pip install mypy
+    NACHET_MYPYC=1 pip install --no-build-isolation .
+
+Otherwise the package is installed as pure Python.
+"""
+import os
+
+from setuptools import setup
+
+MYPYC_MODULES = [
+    "datastore/db/metadata/machine_learning/__init__.py",
+]
+
+ext_modules = []
+if os.environ.get("NACHET_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    # Only type check the compiled modules, not the whole datastore package
+    ext_modules = mypycify(["--follow-imports=silent", *MYPYC_MODULES])
+
+setup(ext_modules=ext_modules)
@@ -191,6 +191,14 @@ class test_picture(unittest.TestCase):
         #self.cur.execute("SELECT result FROM inference WHERE picture_id=%s AND model_id=%s",(picture_id,model_id,))
         self.assertTrue(validator.is_valid_uuid(result["inference_id"]))
 
+    def test_register_inference_result_invalid_user_id(self):
+        """
+        Test the register inference result function with a user id that is not a UUID.
+        """
+        picture_id = asyncio.run(datastore.upload_picture_unknown(self.cur, self.user_id, self.pic_encoded,self.container_client))
+        with self.assertRaises(datastore.user.UserNotFoundError):
+            asyncio.run(datastore.register_inference_result(self.cur,"not-a-uuid",self.inference, picture_id, "test_model_id"))
+
     def test_create_picture_set(self):
         """
         Test the creation of a picture set
@@ -362,6 +370,15 @@ class test_feedback(unittest.TestCase):
         with self.assertRaises(datastore.user.UserNotFoundError):
             asyncio.run(datastore.new_perfect_inference_feeback(self.cur, self.inference_id, str(uuid.uuid4()), self.boxes_id))
     
+    def test_new_perfect_inference_feedback_error_invalid_ids(self):
+        """
+        This test checks if the new_perfect_inference_feeback function reports an id that is not a UUID as not found
+        """
+        with self.assertRaises(datastore.user.UserNotFoundError):
+            asyncio.run(datastore.new_perfect_inference_feeback(self.cur, self.inference_id, "not-a-uuid", self.boxes_id))
+        with self.assertRaises(datastore.inference.InferenceNotFoundError):
+            asyncio.run(datastore.new_perfect_inference_feeback(self.cur, "not-a-uuid", self.user_id, self.boxes_id))
+
     def test_new_perfect_inference_feedback_connection_error(self):
         """
         This test checks if the new_perfect_inference_feeback function correctly raise an exception if the connection to the db fails
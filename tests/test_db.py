@@ -5,6 +5,7 @@ It tests the functions in the user, seed and picture modules.
 
 import unittest
 from unittest.mock import MagicMock
+from psycopg.pq import TransactionStatus
 import uuid
 import json
 from PIL import Image
@@ -14,6 +15,7 @@ from time import sleep
 from datastore.db.queries import user,seed,picture,inference,analysis
 from datastore.db.metadata import picture_set as picture_set_data,picture as picture_data,validator
 import datastore.db.__init__ as db
+from datastore.db import init_pool, close_pool, PoolNotInitializedError
 
 
 # --------------------  USER FUNCTIONS --------------------
@@ -248,6 +250,22 @@ class test_seed_functions(unittest.TestCase):
         with self.assertRaises(seed.SeedNotFoundError):
             seed.get_seed_id(self.cursor, "nonexistant_seed")
 
+    def test_get_seed_ids(self):
+        """
+        This test checks if the get_seed_ids function returns the UUID of every seed name
+        """
+        seed_uuid = seed.new_seed(self.cursor, self.seed_name)
+        fetch_ids = seed.get_seed_ids(self.cursor, [self.seed_name, self.seed_name])
+        self.assertEqual(fetch_ids, {self.seed_name: seed_uuid})
+
+    def test_get_nonexistant_seed_ids(self):
+        """
+        This test checks if the get_seed_ids function raises an exception when a seed does not exist
+        """
+        seed.new_seed(self.cursor, self.seed_name)
+        with self.assertRaises(seed.SeedNotFoundError):
+            seed.get_seed_ids(self.cursor, [self.seed_name, "nonexistant_seed"])
+
     def test_get_seed_id_error(self):
         """
         This test checks if the get_seed_id function raises an exception when the connection fails
@@ -570,14 +588,69 @@ class test_inference_functions(unittest.TestCase):
             validator.is_valid_uuid(inference_id), "The inference_id is not a valid UUID"
         )
         
+    def test_new_inference_dict(self):
+        """
+        This test checks if the new_inference function accepts a dict without encoding it first
+        """
+        inference_id = inference.new_inference(self.cursor, json.loads(self.inference_trim), self.user_id, self.picture_id, self.type)
+        self.cursor.execute("SELECT inference FROM inference WHERE id=%s", (inference_id,))
+        self.assertEqual(self.cursor.fetchone()[0], json.loads(self.inference_trim))
+
     def test_new_inference_error(self):
         """
         This test checks if the new_inference function raises an exception when the connection fails
         """
         mock_cursor = MagicMock()
+        error = Exception("Connection error")
+        mock_cursor.fetchone.side_effect = error
+        with self.assertRaises(inference.InferenceCreationError) as context:
+            inference.new_inference(mock_cursor, self.inference_trim, self.user_id, self.picture_id, self.type)
+        self.assertIs(context.exception.__cause__, error)
+
+    def test_create_inference_tree(self):
+        """
+        This test checks if the create_inference_tree function uploads the inference with its objects and seed objects
+        """
+        objects = []
+        for box in self.inference["boxes"]:
+            seeds = [{"seed_id": self.seed_id, "score": topN["score"]} for topN in box["topN"]]
+            objects.append({"box_metadata": json.dumps(box), "type_id": self.type, "seeds": seeds})
+        inference_id = inference.create_inference_tree(self.cursor, self.inference_trim, self.user_id, self.picture_id, objects)
+        self.assertTrue(
+            validator.is_valid_uuid(inference_id), "The inference_id is not a valid UUID"
+        )
+        objects_db = inference.get_objects_by_inference(self.cursor, inference_id)
+        self.assertEqual(len(objects_db),len(objects), "The number of objects is not the same as the expected one")
+        for obj in objects:
+            top_score = max(seed_obj["score"] for seed_obj in obj["seeds"])
+            top_id = inference.get_inference_object_top_id(self.cursor, obj["id"])
+            self.assertEqual(str(top_id), obj["top_id"], "The top_id is not the same as the expected one")
+            for seed_obj in obj["seeds"]:
+                self.assertTrue(validator.is_valid_uuid(seed_obj["id"]), "The seed_obj_id is not a valid UUID")
+                if seed_obj["score"] == top_score:
+                    self.assertEqual(seed_obj["id"], obj["top_id"], "The top_id is not the seed object with the highest score")
+            fetched_seed_obj_id = inference.get_seed_object_id(self.cursor, self.seed_id, obj["id"])
+            self.assertIsNotNone(fetched_seed_obj_id, "The seed objects were not uploaded")
+
+    def test_create_inference_tree_dict(self):
+        """
+        This test checks if the create_inference_tree function stores the box_metadata dicts as json objects
+        """
+        box = self.inference["boxes"][0]
+        objects = [{"box_metadata": box, "type_id": self.type, "seeds": [{"seed_id": self.seed_id, "score": box["score"]}]}]
+        inference_id = inference.create_inference_tree(self.cursor, json.loads(self.inference_trim), self.user_id, self.picture_id, objects)
+        self.assertEqual(inference.get_inference(self.cursor, inference_id), json.loads(self.inference_trim))
+        inference_obj = inference.get_inference_object(self.cursor, objects[0]["id"])
+        self.assertEqual(inference_obj[1], box)
+
+    def test_create_inference_tree_error(self):
+        """
+        This test checks if the create_inference_tree function raises an exception when the connection fails
+        """
+        mock_cursor = MagicMock()
         mock_cursor.fetchone.side_effect = Exception("Connection error")
         with self.assertRaises(inference.InferenceCreationError):
-            inference.new_inference(mock_cursor, self.inference_trim, self.user_id, self.picture_id, self.type)
+            inference.create_inference_tree(mock_cursor, self.inference_trim, self.user_id, self.picture_id, [])
 
     def test_new_inference_obj(self):
         """
@@ -620,7 +693,44 @@ class test_inference_functions(unittest.TestCase):
         mock_cursor.fetchone.side_effect = Exception("Connection error")
         with self.assertRaises(inference.SeedObjectCreationError):
             inference.new_seed_object(mock_cursor,self.seed_id,inference_obj_id,32.1)
-      
+
+    def test_new_inference_objects_batch(self):
+        """
+        This test checks if the new_inference_objects_batch function returns a valid UUID for each object
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        objects=[(json.dumps(box),self.type,False) for box in self.inference["boxes"]]
+        inference_obj_ids=inference.new_inference_objects_batch(self.cursor,inference_id,objects)
+        self.assertEqual(len(inference_obj_ids),len(objects), "The number of objects is not the same as the expected one")
+        for inference_obj_id in inference_obj_ids:
+            self.assertTrue(
+                validator.is_valid_uuid(inference_obj_id), "The inference_obj_id is not a valid UUID"
+            )
+        objects_db = inference.get_objects_by_inference(self.cursor, inference_id)
+        self.assertEqual(len(objects_db),len(objects), "The number of objects in the database is not the same as the expected one")
+
+    def test_new_seed_objects_batch(self):
+        """
+        This test checks if the new_seed_objects_batch function returns the UUIDs in the order of the given rows
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        inference_obj_id=inference.new_inference_object(self.cursor,inference_id,json.dumps(self.inference["boxes"][0]),self.type)
+        rows=[(self.seed_id,inference_obj_id,topN["score"]) for topN in self.inference["boxes"][0]["topN"]]
+        seed_obj_ids=inference.new_seed_objects_batch(self.cursor,rows)
+        self.assertEqual(len(seed_obj_ids),len(rows), "The number of seed objects is not the same as the expected one")
+        for seed_obj_id, row in zip(seed_obj_ids, rows):
+            self.cursor.execute("SELECT score FROM seed_obj WHERE id=%s",(seed_obj_id,))
+            self.assertEqual(self.cursor.fetchone()[0],row[2], "The seed object is not in the expected order")
+
+    def test_new_seed_objects_batch_error(self):
+        """
+        This test checks if the new_seed_objects_batch function raises an exception when the connection fails
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.side_effect = Exception("Connection error")
+        with self.assertRaises(inference.SeedObjectCreationError):
+            inference.new_seed_objects_batch(mock_cursor,[(self.seed_id,str(uuid.uuid4()),32.1)])
+
     def test_get_inference(self):
         """
         This test checks if the get_inference function returns a correctly build inference
@@ -635,6 +745,69 @@ class test_inference_functions(unittest.TestCase):
             self.assertTrue(key in inference_data, f"The key: {key} is not in the inference")
             self.assertEqual(inference_trim[key],inference_data[key],f"The value ({inference_data[key]}) of the key: {key} is not the same as the expected one: {inference_trim[key]}")
               
+    def test_get_inference_uuid(self):
+        """
+        This test checks if the get_inference function accepts the id as a uuid.UUID or a string
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,uuid.UUID(str(self.user_id)),str(self.picture_id),self.type)
+        self.assertEqual(
+            inference.get_inference(self.cursor,uuid.UUID(str(inference_id))),
+            inference.get_inference(self.cursor,str(inference_id)),
+        )
+
+    def test_get_inference_cache(self):
+        """
+        This test checks if the get_inference function reads an inference from the cache once it has been fetched outside of a transaction
+        """
+        inference_id = uuid.uuid4()
+        committed_cursor = MagicMock()
+        committed_cursor.connection.info.transaction_status = TransactionStatus.IDLE
+        committed_cursor.fetchone.return_value = (json.loads(self.inference_trim),)
+        inference_data = inference.get_inference(committed_cursor, inference_id)
+        mock_cursor = MagicMock()
+        self.assertEqual(inference.get_inference(mock_cursor, str(inference_id)), inference_data)
+        mock_cursor.execute.assert_not_called()
+
+    def test_get_inference_cache_copy(self):
+        """
+        This test checks if mutating an inference returned by get_inference does not change the cached inference
+        """
+        inference_id = uuid.uuid4()
+        committed_cursor = MagicMock()
+        committed_cursor.connection.info.transaction_status = TransactionStatus.IDLE
+        committed_cursor.fetchone.return_value = (json.loads(self.inference_trim),)
+        inference.get_inference(committed_cursor, inference_id)["filename"] = "mutated"
+        self.assertEqual(inference.get_inference(None, inference_id), json.loads(self.inference_trim))
+
+    def test_get_inference_cache_transaction(self):
+        """
+        This test checks if the get_inference function does not cache an inference read inside a transaction
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        inference.get_inference(self.cursor,inference_id)
+        mock_cursor = MagicMock()
+        inference.get_inference(mock_cursor,inference_id)
+        mock_cursor.execute.assert_called_once()
+
+    def test_get_inference_object_after_update(self):
+        """
+        This test checks if the get_inference_object function returns the object as updated by the setters
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        inference_obj_id=inference.new_inference_object(self.cursor,inference_id,json.dumps(self.inference["boxes"][0]),self.type)
+        inference.get_inference_object(self.cursor,inference_obj_id)
+        inference.set_inference_object_valid(self.cursor,inference_obj_id,True)
+        self.assertTrue(inference.get_inference_object(self.cursor,inference_obj_id)[6])
+        inference.set_inference_objects_valid_batch(self.cursor,[(inference_obj_id,False)])
+        self.assertFalse(inference.get_inference_object(self.cursor,inference_obj_id)[6])
+
+    def test_get_inference_invalid_uuid(self):
+        """
+        This test checks if the get_inference function raises an exception when the id is not a UUID
+        """
+        with self.assertRaises(inference.InferenceNotFoundError):
+            inference.get_inference(self.cursor,"not-a-uuid")
+
     def test_get_inference_object(self):
         """
         This test checks if the get_inference_object function returns a correctly build object
@@ -674,6 +847,66 @@ class test_inference_functions(unittest.TestCase):
             self.assertEqual(object[2],inference_id, "The inference id is not the same as the expected one")
             self.assertTrue(object[0] in objects_id, "The object id is not in the list of expected objects")
 
+    def test_get_objects_by_inference_columns(self):
+        """
+        This test checks if the get_objects_by_inference function only returns the requested columns
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        inference_obj_id=inference.new_inference_object(self.cursor,inference_id,json.dumps(self.inference["boxes"][0]),self.type)
+
+        objects = inference.get_objects_by_inference(self.cursor, inference_id, columns=("id","verified_id"))
+        self.assertEqual(objects, [(inference_obj_id, None)], "The objects are not the expected ones")
+
+        with self.assertRaises(ValueError):
+            inference.get_objects_by_inference(self.cursor, inference_id, columns=("id","unknown_column"))
+
+    def test_get_objects_by_inference_server_cursor(self):
+        """
+        This test checks if the get_objects_by_inference function streams the objects from a server side cursor
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        objects_id=[]
+        for box in self.inference["boxes"]:
+            objects_id.append(inference.new_inference_object(self.cursor,inference_id,json.dumps(box),self.type))
+
+        objects = list(inference.get_objects_by_inference(self.cursor, inference_id, server_cursor=True))
+        self.assertEqual(len(objects),len(objects_id), "The number of objects is not the same as the expected one")
+        for object in objects:
+            self.assertTrue(object[0] in objects_id, "The object id is not in the list of expected objects")
+
+    def test_export_import_objects_binary(self):
+        """
+        This test checks if the objects exported by export_objects_binary are imported back by import_objects_binary
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        for box in self.inference["boxes"]:
+            inference.new_inference_object(self.cursor,inference_id,json.dumps(box),self.type)
+        objects = inference.get_objects_by_inference(self.cursor, inference_id)
+
+        fileobj = io.BytesIO()
+        inference.export_objects_binary(self.cursor, [inference_id], fileobj)
+        self.cursor.execute("DELETE FROM object WHERE inference_id=%s", (inference_id,))
+        fileobj.seek(0)
+        inference.import_objects_binary(self.cursor, fileobj)
+
+        self.assertEqual(sorted(inference.get_objects_by_inference(self.cursor, inference_id)), sorted(objects))
+
+    def test_export_objects_binary_error(self):
+        """
+        This test checks if the export_objects_binary function raises an exception when the connection fails
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.copy.side_effect = Exception("Connection error")
+        with self.assertRaises(Exception):
+            inference.export_objects_binary(mock_cursor, [str(uuid.uuid4())], io.BytesIO())
+
+    def test_get_objects_by_inference_server_cursor_without_cursor(self):
+        """
+        This test checks if the get_objects_by_inference function refuses to stream the objects from a pool connection
+        """
+        with self.assertRaises(ValueError):
+            inference.get_objects_by_inference(None, str(uuid.uuid4()), server_cursor=True)
+
     def test_get_inference_object_top_id(self):
         """
         This test checks if the get_inference_object_top_id function returns the correct top_id of an inference object
@@ -687,6 +920,40 @@ class test_inference_functions(unittest.TestCase):
         
         self.assertEqual(seed_obj_id,top_id,"The verified_id is not the same as the expected one")
         
+    def test_set_inference_object_top_id(self):
+        """
+        This test checks if the set_inference_object_top_id function returns the updated top_id
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        inference_obj_id=inference.new_inference_object(self.cursor,inference_id,json.dumps(self.inference["boxes"][0]),self.type)
+        seed_obj_id=inference.new_seed_object(self.cursor,self.seed_id,inference_obj_id,self.inference["boxes"][0]["score"])
+
+        updated = inference.set_inference_object_top_id(self.cursor,inference_obj_id,seed_obj_id)
+        self.assertEqual(updated[0],seed_obj_id,"The returned top_id is not the same as the expected one")
+
+    def test_set_inference_object_verified_id_returning(self):
+        """
+        This test checks if the set_inference_object_verified_id function returns the updated row
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        inference_obj_id=inference.new_inference_object(self.cursor,inference_id,json.dumps(self.inference["boxes"][0]),self.type)
+        seed_obj_id=inference.new_seed_object(self.cursor,self.seed_id,inference_obj_id,self.inference["boxes"][0]["score"])
+
+        updated_at, verified_id = inference.set_inference_object_verified_id(self.cursor,inference_obj_id,seed_obj_id)
+        inference_obj=inference.get_inference_object(self.cursor,inference_obj_id)
+        self.assertEqual(verified_id,seed_obj_id,"The returned verified_id is not the same as the expected one")
+        self.assertEqual(updated_at,inference_obj[9],"The returned updated_at is not the same as the stored one")
+
+    def test_set_inference_feedback_user_id(self):
+        """
+        This test checks if the set_inference_feedback_user_id function returns the updated inference
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+
+        updated = inference.set_inference_feedback_user_id(self.cursor,inference_id,self.user_id)
+        self.assertEqual(updated[0],inference_id,"The returned inference id is not the same as the expected one")
+        self.assertEqual(updated[1],self.user_id,"The returned feedback_user_id is not the same as the expected one")
+
     def test_set_inference_object_verified_id(self):
         """
         This test checks if the set_inference_object_verified_id function returns a correctly update inference object
@@ -725,6 +992,60 @@ class test_inference_functions(unittest.TestCase):
         # this test is not working because the trigger to update the update_at field is missing
         self.assertNotEqual(inference_obj[8],previous_inference_obj[8],"The update_at field is not updated")
         
+    def test_set_inference_objects_batch(self):
+        """
+        This test checks if the set_inference_objects_*_batch functions update every given object
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        objects=[(json.dumps(box),self.type,False) for box in self.inference["boxes"]]
+        inference_obj_ids=inference.new_inference_objects_batch(self.cursor,inference_id,objects)
+        seed_obj_ids=inference.new_seed_objects_batch(self.cursor,[(self.seed_id,obj_id,0.5) for obj_id in inference_obj_ids])
+        pairs=list(zip(inference_obj_ids,seed_obj_ids))
+
+        inference.set_inference_objects_top_id_batch(self.cursor,pairs)
+        inference.set_inference_objects_verified_id_batch(self.cursor,pairs)
+        inference.set_inference_objects_valid_batch(self.cursor,[(obj_id,True) for obj_id in inference_obj_ids])
+        for inference_obj_id, seed_obj_id in pairs:
+            inference_obj=inference.get_inference_object(self.cursor,inference_obj_id)
+            self.assertEqual(inference_obj[4],seed_obj_id,"The verified_id is not the same as the expected one")
+            self.assertEqual(inference_obj[5],seed_obj_id,"The top_id is not the same as the expected one")
+            self.assertTrue(inference_obj[6],"The object validity is not the same as the expected one")
+
+    def test_set_inference_objects_batch_error(self):
+        """
+        This test checks if the set_inference_objects_verified_id_batch function raises an exception when the connection fails
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = Exception("Connection error")
+        with self.assertRaises(Exception):
+            inference.set_inference_objects_verified_id_batch(mock_cursor,[(str(uuid.uuid4()),str(uuid.uuid4()))])
+
+    def test_set_inference_objects_verified_top_id_batch(self):
+        """
+        This test checks if the set_inference_objects_verified_top_id_batch function sets the objects valid and verified with their top_id
+        """
+        inference_id=inference.new_inference(self.cursor,self.inference_trim,self.user_id,self.picture_id,self.type)
+        objects_id=[]
+        for box in self.inference["boxes"]:
+            object_id=inference.new_inference_object(self.cursor,inference_id,json.dumps(box),self.type)
+            seed_obj_id=inference.new_seed_object(self.cursor,self.seed_id,object_id,box["score"])
+            inference.set_inference_object_top_id(self.cursor,object_id,seed_obj_id)
+            objects_id.append((object_id,seed_obj_id))
+        inference.set_inference_objects_verified_top_id_batch(self.cursor,[object_id for object_id, _ in objects_id])
+        for object_id, seed_obj_id in objects_id:
+            inference_obj=inference.get_inference_object(self.cursor,object_id)
+            self.assertEqual(inference_obj[4],seed_obj_id,"The verified_id is not the top_id")
+            self.assertTrue(inference_obj[6],"The object is not valid")
+
+    def test_set_inference_objects_verified_top_id_batch_error(self):
+        """
+        This test checks if the set_inference_objects_verified_top_id_batch function raises an exception when the connection fails
+        """
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = Exception("Connection error")
+        with self.assertRaises(Exception):
+            inference.set_inference_objects_verified_top_id_batch(mock_cursor,[str(uuid.uuid4())])
+
     def test_is_inference_verified(self):
         """
         Test if is_inference_verified function correctly returns the inference status
@@ -781,6 +1102,30 @@ class test_inference_functions(unittest.TestCase):
         fetched_seed_obj_id = inference.get_seed_object_id(self.cursor,mock_seed_id, inference_obj_id)
         self.assertTrue(fetched_seed_obj_id is None, "The fetched seed object id should be None")
         
+class test_pool_functions(unittest.TestCase):
+    def setUp(self):
+        init_pool(min_size=1, max_size=2)
+
+    def tearDown(self):
+        close_pool()
+
+    def test_query_with_pool(self):
+        """
+        This test checks if a query function called without a cursor runs on a connection of the pool
+        """
+        self.assertFalse(
+            inference.check_inference_exist(None, str(uuid.uuid4())),
+            "The inference should not exist",
+        )
+
+    def test_query_without_pool(self):
+        """
+        This test checks if a query function called without a cursor raises an exception when the pool is not initialized
+        """
+        close_pool()
+        with self.assertRaises(PoolNotInitializedError):
+            inference.check_inference_exist(None, str(uuid.uuid4()))
+
 class test_analysis_functions(unittest.TestCase):
     def setUp(self):
         # prepare the connection and cursor
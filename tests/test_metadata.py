@@ -114,7 +114,7 @@ class test_inference_functions(unittest.TestCase):
 
     def test_build_inference_import(self):
         """
-        This test checks if the build_inference_import function returns a valid JSON object
+        This test checks if the build_inference_import function returns a valid inference db object
         """
         mock_inference = {
             "filename": self.filename,
@@ -122,7 +122,6 @@ class test_inference_functions(unittest.TestCase):
             "totalBoxes": self.total_boxes,
         }
         inference_tested = inference.build_inference_import(self.inference_exemple)
-        inference_tested = json.loads(inference_tested)
         self.assertGreaterEqual(len(mock_inference), len(inference_tested), "The inference returned has too many keys")
         for key, value in mock_inference.items():
             self.assertTrue( key in inference_tested, f"{key} should be in the inference object")
@@ -134,11 +133,11 @@ class test_inference_functions(unittest.TestCase):
 
     def test_build_object_import(self):
         """
-        This test checks if the build_object_import function returns a valid JSON object
+        This test checks if the build_object_import function returns a valid object db object
         """
         object =self.boxes[0]
         object_tested = inference.build_object_import(object)
-        data = json.loads(object_tested)
+        data = object_tested
         mock_object = {
             "box": {
                 "topX": 0.0,
@@ -245,6 +244,15 @@ class test_machine_learning_functions(unittest.TestCase):
         for key in pipeline_data:
             self.assertEqual(pipeline_data[key], self.mock_pipeline[key], f"The pipeline data for the key:{key} should be {self.mock_pipeline[key]}")
 
+    def test_build_pipeline_import_exact_keys(self):
+        """
+        This test checks if the build_pipeline_import function returns the same object when the pipeline has only the db keys
+        """
+        pipeline = self.ml_structure["pipelines"][0]
+        pipeline_import = json.loads(ml_data.build_pipeline_import(pipeline))
+        exact_pipeline = {key: pipeline[key] for key in pipeline_import}
+        self.assertEqual(json.loads(ml_data.build_pipeline_import(exact_pipeline)), pipeline_import)
+
     def test_missing_key_build_pipeline_import(self):
         """
         This test checks if the build_pipeline_import function raises an error when a key is missing